@@ -1,9 +1,127 @@
 import sys
 import socket
 import time
-import threading
+import asyncio
 import os
-import random
+import ctypes
+import array
+import struct
+import math
+import platform
+
+try:
+    from _checksum import ones_complement_sum as _ones_complement
+except ImportError:
+    _ones_complement = None
+
+# Size of a ping message per project's ICMP message format
+_MSG_SIZE = 14
+
+# NumPy module for summing long checksum inputs; imported on first use since
+# ping messages themselves are too short to need it (False if unavailable)
+_np = None
+
+# Whole message (type, code, checksum, identifier, seqno, and the 6-byte
+# timestamp split into its high 16 and low 32 bits), and a single 16-bit
+# field (checksum, seqno)
+_MESSAGE = struct.Struct('>BBHHHHI')
+_UINT16 = struct.Struct('>H')
+
+# Maximum number of echo requests handed to the kernel per sendmmsg call
+_SEND_BATCH = 64
+# Maximum number of echo replies drained per recvmmsg call, and the size of
+# each preallocated receive buffer
+_RECV_BATCH = 64
+_RECV_SIZE = 2048
+# Maximum number of flood pings awaiting a reply at once, kept well below
+# the ~256 small datagrams a default socket receive buffer can hold
+_FLOOD_WINDOW = 128
+# Receive buffer bytes requested per ping, covering the kernel's per-datagram
+# accounting overhead for a small reply
+_RCVBUF_PER_REPLY = 1024
+
+
+class _IOVec(ctypes.Structure):
+    """struct iovec from <sys/uio.h>"""
+    _fields_ = [('iov_base', ctypes.c_void_p),
+                ('iov_len', ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    """struct msghdr from <sys/socket.h> (Linux layout)"""
+    _fields_ = [('msg_name', ctypes.c_void_p),
+                ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_IOVec)),
+                ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p),
+                ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+
+class _MMsgHdr(ctypes.Structure):
+    """struct mmsghdr from <sys/socket.h>"""
+    _fields_ = [('msg_hdr', _MsgHdr),
+                ('msg_len', ctypes.c_uint)]
+
+
+class _CMsgHdr(ctypes.Structure):
+    """struct cmsghdr from <sys/socket.h> (Linux layout)"""
+    _fields_ = [('cmsg_len', ctypes.c_size_t),
+                ('cmsg_level', ctypes.c_int),
+                ('cmsg_type', ctypes.c_int)]
+
+
+class _Timespec(ctypes.Structure):
+    """struct timespec from <time.h>"""
+    _fields_ = [('tv_sec', ctypes.c_long),
+                ('tv_nsec', ctypes.c_long)]
+
+
+# Linux socket option (and control message type) for nanosecond kernel
+# receive timestamps. Not exposed by every Python build's socket module, so
+# fall back to the asm-generic value 35, but only on architectures known to
+# use it (others, e.g. sparc and parisc, number it differently); elsewhere
+# kernel timestamping is skipped
+_SO_TIMESTAMPNS = getattr(socket, 'SO_TIMESTAMPNS', None)
+if _SO_TIMESTAMPNS is None and sys.platform.startswith('linux') and \
+        platform.machine() in ('x86_64', 'i386', 'i486', 'i586', 'i686',
+                               'aarch64', 'armv7l', 'armv8l', 'riscv64'):
+    _SO_TIMESTAMPNS = 35
+
+# sendmmsg/recvmmsg are Linux-only; elsewhere batches fall back to one
+# send/recv per packet
+_sendmmsg = None
+_recvmmsg = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL('libc.so.6', use_errno=True)
+        _sendmmsg = _libc.sendmmsg
+        _recvmmsg = _libc.recvmmsg
+    except (OSError, AttributeError):
+        _sendmmsg = _recvmmsg = None
+    else:
+        _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr),
+                              ctypes.c_uint, ctypes.c_int]
+        _sendmmsg.restype = ctypes.c_int
+        _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr),
+                              ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+        _recvmmsg.restype = ctypes.c_int
+
+
+def _numpy():
+    """Imports NumPy on first call.
+    No inputs.
+    Outputs: numpy module, or False if not installed
+    """
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            _np = False
+        else:
+            _np = numpy
+    return _np
 
 
 class PingClient:
@@ -13,14 +131,40 @@ class PingClient:
         self.server_ip = server_ip
         self.server_port = int(server_port)
         self.count = int(count)
+        # sequence numbers are carried in a 2-byte field
+        if not 1 <= self.count <= 65535:
+            raise ValueError(f'count must be between 1 and 65535, '
+                             f'got {self.count}')
         self.period = int(period) / 1000  # milliseconds
         self.timeout = int(timeout) / 1000  # milliseconds
+        self._ident = os.getpid() % 65536
         self.total_start = 0
         self.total_end = 0
         self.request_count = 0
         self.reply_count = 0
-        self.rtt_list = []
-        self.thread_list = []
+        # rtt (ms) per sequence number, -1 until a reply arrives; public
+        # per-ping record for callers (summary statistics use the running
+        # totals below)
+        self.rtt_array = array.array('i', [-1]) * self.count
+        # running rtt statistics, updated as each reply arrives
+        self._rtt_min = math.inf
+        self._rtt_max = 0
+        self._rtt_sum = 0
+        self._rtt_samples = 0
+        self._sock = None
+        self._sock_fd = -1
+        self._recv_bufs = None  # preallocated recvmmsg buffers and headers
+        self._recv_iovs = None
+        self._recv_hdrs = None
+        self._recv_ctrl = None  # per-message SCM_TIMESTAMPNS buffers
+        # whether the kernel stamps replies on arrival (SO_TIMESTAMPNS)
+        self._kernel_timestamps = False
+        self._pending = {}  # seq_num -> future awaiting (data, recv_ns)
+        self._outstanding = 0
+        self._in_flight = 0  # requests sent but not yet replied/timed out
+        self._resolved = None  # event set whenever a request is resolved
+        self._done = None
+        self._out_lines = []  # output queued until the next flush
 
     def build_message(self, seq_num):
         """Build a binary message according to project's ICMP message format:
@@ -35,58 +179,52 @@ class PingClient:
         Outputs: binary object (new_packet)
         """
 
-        # construct message items
-        msg_type = 8  # 8 for echo request per ICMP message format
-        identifier = (os.getpid() % 65536).to_bytes(2, byteorder='big')
-        checksum = (0).to_bytes(2, byteorder='big')
-        seq_num = seq_num.to_bytes(2, byteorder='big')
-        timestamp = int(time.time() * 1000).to_bytes(6, byteorder='big')
-
-        # construct initial message with checksum set to 0
-        msg = bytearray()
-        msg.insert(0, msg_type)
-        msg.insert(1, 0)
-        msg.extend(checksum)
-        msg.extend(identifier)
-        msg.extend(seq_num)
-        msg.extend(timestamp)
-
-        # calculate checksum with initial message
-        checksum = self.calculate_checksum(msg)
-        checksum = self.bit_flip(checksum).to_bytes(2, byteorder='big')
-
-        # create final message inserting checksum calculated
-        final_msg = bytearray()
-        final_msg.insert(0, msg_type)
-        final_msg.insert(1, 0)
-        final_msg.extend(checksum)
-        final_msg.extend(identifier)
-        final_msg.extend(seq_num)
-        final_msg.extend(timestamp)
-
-        return final_msg
+        # construct message with checksum set to 0 (type 8 for echo request
+        # per ICMP message format, code 0)
+        timestamp = time.time_ns() // 1_000_000
+        msg = bytearray(_MSG_SIZE)
+        _MESSAGE.pack_into(msg, 0, 8, 0, 0, self._ident, seq_num,
+                           timestamp >> 32, timestamp & 0xffffffff)
+
+        # calculate checksum with initial message and insert its flipped
+        # bits in place
+        _UINT16.pack_into(msg, 2, self.calculate_checksum(msg) ^ 0xffff)
+
+        return msg
 
     def calculate_checksum(self, message):
-        """Calculates one's complement sum of given message.
+        """Calculates one's complement sum of given message, taken over its
+        big-endian 16-bit words (a trailing odd byte is ignored). Uses the
+        _checksum C extension when built, otherwise long messages are summed
+        with NumPy when it is available.
         Inputs: bytes object (message)
         Outputs: integer
         **Note: Referenced stack overflow for implementation of this calculation**
         Source: https://stackoverflow.com/questions/3949726/calculate-ip-checksum-
         in-python
         """
-        s = 0
-        for i in range(0, len(message)-1, 2):
-            w = (message[i]) + (message[i + 1] << 8) << 8
-            s = ((w + s) & 0xffff) + ((w + s) >> 16)
+        if _ones_complement is not None:
+            return _ones_complement(message)
+
+        length = len(message) & ~1
+        np = _numpy() if length > 32 else None
+        if np:
+            words = np.frombuffer(message, dtype='>u2', count=length // 2)
+            s = int(words.sum(dtype=np.uint64))
+            swap = False
+        else:
+            # sum native-endian words; the one's complement sum is byte order
+            # independent (RFC 1071), so byte-swapping the folded result
+            # gives the big-endian sum on little-endian hosts
+            s = sum(memoryview(message)[:length].cast('H'))
+            swap = sys.byteorder == 'little'
+        # fold carries back into the low 16 bits
+        s = (s & 0xffff) + (s >> 16)
+        s = (s & 0xffff) + (s >> 16)
+        if swap:
+            s = ((s & 0xff) << 8) | (s >> 8)
         return s
 
-    def bit_flip(self, checksum):
-        """Flips checksum bits.
-        Inputs: integer (checksum)
-        Outputs: integer
-        """
-        return 0xffff - checksum
-
     def summary_statistics(self):
         """Method which captures the summary statistics for a series of pings
         sent to the server and outputs string to be printed.
@@ -98,14 +236,14 @@ class PingClient:
         transmitted = str(self.request_count)
         received = str(self.reply_count)
         loss = str(round((1 - self.reply_count / self.request_count) * 100))
-        total_time = str(round(self.total_end - self.total_start))
+        total_time = str((self.total_end - self.total_start) // 1_000_000)
 
         display_str += f'{transmitted} transmitted, {received} received, ' \
                        f'{loss}% loss, time {total_time} ms\n'
         if self.reply_count:
-            rtt_min = str(min(self.rtt_list))
-            rtt_avg = str(round(sum(self.rtt_list) / len(self.rtt_list)))
-            rtt_max = str(max(self.rtt_list))
+            rtt_min = str(self._rtt_min)
+            rtt_avg = str(round(self._rtt_sum / self._rtt_samples))
+            rtt_max = str(self._rtt_max)
             display_str += f'rtt min/avg/max = {rtt_min}/{rtt_avg}/{rtt_max} '\
                            f'ms'
         else:
@@ -113,99 +251,352 @@ class PingClient:
 
         return display_str
 
-    def send_ping(self, seq_num):
-        """Main method of ping client. Sends ping request to client and
-        captures ping reply from server. Prints details relating to current
-        message request/reply.
+    def _send(self, seq_num):
+        """Sends ping request for given sequence number over the shared
+        endpoint and schedules a task awaiting its reply.
         Inputs: integer (seq_num)
         No Outputs.
         """
-        # Create a client socket, bind to random port, and set timeout of sock
-        client_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        rand_port = random.randint(1024, 65535)
-        host = socket.gethostbyname(socket.gethostname())
-        client_sock.bind((host, rand_port))
-        client_sock.settimeout(self.timeout)
-
-        # If first request, print relevant message
-        if seq_num == 1:
-            print(f'PING {self.server_ip}')
-        # Try - send ping request to server
+        self._send_batch([seq_num])
+
+    def _send_batch(self, seq_nums):
+        """Sends ping requests for given sequence numbers together and
+        schedules a task awaiting each reply.
+        Inputs: list of integers (seq_nums)
+        No Outputs.
+        """
+        loop = asyncio.get_running_loop()
+        # build request messages and register futures for replies before
+        # sending so a fast reply is not missed
+        packets = []
+        futures = []
+        for seq_num in seq_nums:
+            packets.append(self.build_message(seq_num))
+            future = loop.create_future()
+            self._pending[seq_num] = future
+            futures.append(future)
+
+        # Mark start time for calculating request message rtt (ns)
+        start_ns = time.monotonic_ns()
+        # Send echo request messages to server
+        self.flush_send_batch(packets)
+        self._in_flight += len(seq_nums)
+        for seq_num, future in zip(seq_nums, futures):
+            loop.create_task(self._await_reply(seq_num, future, start_ns))
+
+    def flush_send_batch(self, packets):
+        """Sends given request messages to the server, with a single
+        sendmmsg call where available and one send per message otherwise
+        (or for anything the kernel did not accept).
+        Inputs: list of bytearrays (packets)
+        No Outputs.
+        """
+        sent = 0
+        if _sendmmsg is not None and len(packets) > 1:
+            hdrs = (_MMsgHdr * len(packets))()
+            iovs = (_IOVec * len(packets))()
+            for i, packet in enumerate(packets):
+                iovs[i].iov_base = ctypes.addressof(
+                    (ctypes.c_char * len(packet)).from_buffer(packet))
+                iovs[i].iov_len = len(packet)
+                # msg_name left NULL: the socket is connected to the server
+                hdrs[i].msg_hdr.msg_iov = ctypes.pointer(iovs[i])
+                hdrs[i].msg_hdr.msg_iovlen = 1
+            sent = max(_sendmmsg(self._sock_fd, hdrs, len(packets), 0), 0)
+        for packet in packets[sent:]:
+            try:
+                self._sock.send(packet)
+            except OSError:
+                # Send buffer full; request is dropped and will time out
+                pass
+
+    async def _flood(self):
+        """Sends all ping requests back to back in batches, yielding to the
+        event loop between batches so replies are read promptly. At most
+        _FLOOD_WINDOW requests are in flight at once, so replies cannot
+        overflow the socket receive buffer before they are read.
+        No inputs.
+        No Outputs.
+        """
+        for seq_num in range(1, self.count + 1, _SEND_BATCH):
+            last = min(seq_num + _SEND_BATCH, self.count + 1)
+            # Wait for replies (or timeouts) to open the window for this batch
+            while self._in_flight + (last - seq_num) > _FLOOD_WINDOW:
+                self._resolved.clear()
+                await self._resolved.wait()
+            self._send_batch(list(range(seq_num, last)))
+            await asyncio.sleep(0)
+
+    def _alloc_recv_batch(self):
+        """Allocates the receive buffers, iovecs and mmsghdrs reused by every
+        recvmmsg call, plus control buffers for kernel receive timestamps
+        when the socket has SO_TIMESTAMPNS enabled.
+        No inputs.
+        No Outputs.
+        """
+        self._recv_bufs = [ctypes.create_string_buffer(_RECV_SIZE)
+                           for _ in range(_RECV_BATCH)]
+        self._recv_iovs = (_IOVec * _RECV_BATCH)()
+        self._recv_hdrs = (_MMsgHdr * _RECV_BATCH)()
+        for i, buf in enumerate(self._recv_bufs):
+            self._recv_iovs[i].iov_base = ctypes.addressof(buf)
+            self._recv_iovs[i].iov_len = _RECV_SIZE
+            self._recv_hdrs[i].msg_hdr.msg_iov = ctypes.pointer(
+                self._recv_iovs[i])
+            self._recv_hdrs[i].msg_hdr.msg_iovlen = 1
+        if self._kernel_timestamps:
+            ctrl_size = socket.CMSG_SPACE(ctypes.sizeof(_Timespec))
+            self._recv_ctrl = [ctypes.create_string_buffer(ctrl_size)
+                               for _ in range(_RECV_BATCH)]
+            for i, ctrl in enumerate(self._recv_ctrl):
+                self._recv_hdrs[i].msg_hdr.msg_control = \
+                    ctypes.addressof(ctrl)
+
+    def _kernel_recv_ns(self, i):
+        """Extracts the kernel receive timestamp of message i of the last
+        recvmmsg batch from its SCM_TIMESTAMPNS control message.
+        Inputs: integer (i)
+        Outputs: integer (ns since epoch), or None if not present
+        """
+        hdr = self._recv_hdrs[i].msg_hdr
+        if hdr.msg_controllen < socket.CMSG_LEN(ctypes.sizeof(_Timespec)):
+            return None
+        ctrl = self._recv_ctrl[i]
+        cmsg = _CMsgHdr.from_buffer(ctrl)
+        if cmsg.cmsg_level != socket.SOL_SOCKET or \
+                cmsg.cmsg_type != _SO_TIMESTAMPNS:
+            return None
+        ts = _Timespec.from_buffer(ctrl, socket.CMSG_LEN(0))
+        return ts.tv_sec * 1_000_000_000 + ts.tv_nsec
+
+    def _on_readable(self):
+        """Drains available ping replies from the socket until it would
+        block, using recvmmsg batches where available and recv
+        otherwise, and dispatches each to its pending request. Draining
+        only saves readiness wakeups; it cannot recover replies dropped
+        while the loop was busy elsewhere, which is why flood mode bounds
+        the replies in flight (see _flood).
+        No inputs.
+        No Outputs.
+        """
+        if _recvmmsg is not None:
+            while True:
+                # Kernel shrinks msg_controllen to what it wrote; restore it
+                if self._recv_ctrl is not None:
+                    for i, ctrl in enumerate(self._recv_ctrl):
+                        self._recv_hdrs[i].msg_hdr.msg_controllen = \
+                            ctypes.sizeof(ctrl)
+                n = _recvmmsg(self._sock_fd, self._recv_hdrs, _RECV_BATCH, 0,
+                              None)
+                # Mark end time for calculating rtt (ns), preferring the
+                # kernel's arrival timestamp over our wakeup time. Kernel
+                # stamps are CLOCK_REALTIME, so sample both clocks once and
+                # convert them to the monotonic clock rtt is measured on
+                recv_ns = time.monotonic_ns()
+                real_ns = time.time_ns() if self._kernel_timestamps else 0
+                for i in range(n):
+                    data = ctypes.string_at(self._recv_bufs[i],
+                                            self._recv_hdrs[i].msg_len)
+                    end_ns = recv_ns
+                    if self._recv_ctrl is not None:
+                        kernel_ns = self._kernel_recv_ns(i)
+                        if kernel_ns is not None:
+                            end_ns = recv_ns - (real_ns - kernel_ns)
+                    self._dispatch(data, end_ns)
+                # A short batch means the socket is drained (or errored)
+                if n < _RECV_BATCH:
+                    return
+
+        while True:
+            try:
+                data = self._sock.recv(_RECV_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # Error from an earlier send; request will time out
+                continue
+            self._dispatch(data, time.monotonic_ns())
+
+    def _dispatch(self, data, recv_ns):
+        """Resolves the pending request matching a ping reply.
+        Inputs: bytes object (data), integer (recv_ns)
+        No Outputs.
+        """
+        # Ignore datagrams too short to carry a sequence number (request
+        # will time out)
+        if len(data) < 8:
+            return
+        # Match reply to request by sequence number
+        seq_num = _UINT16.unpack_from(data, 6)[0]
+        future = self._pending.pop(seq_num, None)
+        if future is not None and not future.done():
+            future.set_result((data, recv_ns))
+
+    async def _schedule(self):
+        """Sends each ping request at its absolute deadline, period apart
+        from the first (send first immediately before waiting period time),
+        so that scheduling delays do not accumulate.
+        No inputs.
+        No Outputs.
+        """
+        loop = asyncio.get_running_loop()
+        base = loop.time()
+        for i in range(self.count):
+            delay = base + i * self.period - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._send(i + 1)
+
+    async def _await_reply(self, seq_num, future, start_ns):
+        """Awaits ping reply from server for given sequence number. Prints
+        details relating to current message request/reply.
+        Inputs: integer (seq_num), future, integer (start_ns)
+        No Outputs.
+        """
+        # Increment request count since transmitted another message
+        self.request_count += 1
         try:
-            # build request message
-            request_msg = self.build_message(seq_num)
-
-            # Mark start time for calculating request message rtt (ms)
-            start_time = time.time() * 1000
-            # Send echo request message to server and receive any reply
-            client_sock.sendto(request_msg, (self.server_ip, self.server_port))
-            data, address = client_sock.recvfrom(2048)
-            # Mark end time for calculating rtt (ms)
-            end_time = time.time() * 1000
-
-            # Add rtt to list of rtts
-            rtt = int(end_time - start_time)
-            self.rtt_list.append(rtt)
-            # Increment request count since transmitted another message
-            self.request_count += 1
-
-            # Calculate checksum from server
-            server_checksum = self.calculate_checksum(data)
-            # Grab sequence number from reply message
-            server_seq_num = int.from_bytes(data[6:8], byteorder='big')
+            data, end_ns = await asyncio.wait_for(future, self.timeout)
+        # If have timeout exception, count as dropped
+        except asyncio.TimeoutError:
+            self._pending.pop(seq_num, None)
+        else:
+            # Record rtt in the slot for this sequence number
+            # (clamped in case a converted kernel stamp lands before the
+            # send, which would otherwise read as a negative rtt)
+            rtt = max(end_ns - start_ns, 0) // 1_000_000
+            self.rtt_array[seq_num - 1] = rtt
+            if rtt < self._rtt_min:
+                self._rtt_min = rtt
+            if rtt > self._rtt_max:
+                self._rtt_max = rtt
+            self._rtt_sum += rtt
+            self._rtt_samples += 1
+
+            # Calculate checksum from server over the fixed-size message only
+            server_checksum = self.calculate_checksum(
+                memoryview(data)[:_MSG_SIZE])
 
             # If checksum from server reply is invalid, print error message
             # (invalid if sum of headers not = 65535 (all 1's in binary))
             if server_checksum != 65535:
-                print(f'WARNING: checksum verification failure for echo reply '
-                      f'seqno={str(server_seq_num)}')
+                self._write(f'WARNING: checksum verification failure for echo '
+                            f'reply seqno={str(seq_num)}')
             # Otherwise print PONG
             else:
-                print(f'PONG {self.server_ip}: seq={str(server_seq_num)} '
-                      f'time={rtt} ms')
+                self._write(f'PONG {self.server_ip}: seq={str(seq_num)} '
+                            f'time={rtt} ms')
                 # Successfully received a reply
                 self.reply_count += 1
-            client_sock.close()
 
-        # If have timeout exception, count as dropped
-        except socket.timeout:
-            self.request_count += 1
-            client_sock.close()
+        # Open the flood window, and once last outstanding ping is resolved,
+        # wake up run loop
+        self._in_flight -= 1
+        self._resolved.set()
+        self._outstanding -= 1
+        if not self._outstanding:
+            self._done.set_result(None)
+
+    def _write(self, line):
+        """Queues a line of output. Lines queued during one event loop
+        iteration (e.g. replies drained by one recvmmsg call) are written
+        to stdout together.
+        Inputs: string (line)
+        No Outputs.
+        """
+        if not self._out_lines:
+            asyncio.get_running_loop().call_soon(self._flush_output)
+        self._out_lines.append(line + '\n')
+
+    def _flush_output(self):
+        """Writes all queued output lines to stdout in one call.
+        No inputs.
+        No Outputs.
+        """
+        if self._out_lines:
+            sys.stdout.write(''.join(self._out_lines))
+            self._out_lines.clear()
+
+    async def _run_async(self):
+        """Sends all ping requests over a single UDP socket, scheduling
+        each request period apart on the event loop, and waits for every
+        reply or timeout.
+        No inputs.
+        No Outputs.
+        """
+        loop = asyncio.get_running_loop()
+
+        # Resolve server address once for all pings
+        server_info = await loop.getaddrinfo(self.server_ip, self.server_port,
+                                             family=socket.AF_INET,
+                                             type=socket.SOCK_DGRAM)
+
+        # Create one non-blocking client socket bound to a kernel-assigned
+        # port on any local address (no host name lookup needed for egress),
+        # and connect it to the server so sends carry no address and only
+        # the server's replies are received
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._sock.bind(('0.0.0.0', 0))
+        self._sock.connect(server_info[0][4])
+        self._sock_fd = self._sock.fileno()
+        # Make room in the receive buffer for a reply to every ping (the
+        # kernel caps this at net.core.rmem_max)
+        rcvbuf = self.count * _RCVBUF_PER_REPLY
+        if rcvbuf > self._sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF):
+            try:
+                self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                      rcvbuf)
+            except OSError:
+                pass
+        if _recvmmsg is not None:
+            # Have the kernel stamp each reply on arrival so rtt excludes
+            # scheduler delay before we get to read it
+            if _SO_TIMESTAMPNS is not None:
+                try:
+                    self._sock.setsockopt(socket.SOL_SOCKET,
+                                          _SO_TIMESTAMPNS, 1)
+                except OSError:
+                    pass
+                else:
+                    self._kernel_timestamps = True
+            self._alloc_recv_batch()
+        loop.add_reader(self._sock_fd, self._on_readable)
+
+        self._done = loop.create_future()
+        self._outstanding = self.count
+        self._resolved = asyncio.Event()
+
+        # With no period, send back to back in batches; otherwise a single
+        # scheduler task sends each ping at its deadline
+        if not self.period:
+            sender = loop.create_task(self._flood())
+        else:
+            sender = loop.create_task(self._schedule())
+
+        try:
+            # Await the sender too so an error while sending ends the run
+            # rather than leaving it waiting on replies that never come
+            await asyncio.gather(self._done, sender)
+        finally:
+            sender.cancel()
+            loop.remove_reader(self._sock_fd)
+            self._sock.close()
+            self._flush_output()
 
     def run(self):
-        """"""
+        """Runs the ping client and prints summary statistics.
+        No inputs.
+        No Outputs.
+        """
         # Mark start time for total transmission of ping requests
-        self.total_start = time.time() * 1000
-
-        # Initiate sequence number
-        seq_num = 1
-
-        # Spawn and start first thread (send immediately before waiting period
-        # time)
-        thread = threading.Thread(target=self.send_ping, args=[seq_num])
-        thread.start()
-        # Add thread to list of threads
-        self.thread_list.append(thread)
-
-        seq_num += 1
-
-        # Loop through remaining count and create threading timer objects with
-        # interval of period given. Add to thread list and increment sequence
-        # number every time
-        for i in range(self.count - 1):
-            thread = threading.Timer(interval=self.period,
-                                     function=self.send_ping, args=[seq_num])
-            thread.start()
-            self.thread_list.append(thread)
-            seq_num += 1
-
-        # Join threads once all have been started
-        if len(self.thread_list) == self.count:
-            for thread in self.thread_list:
-                thread.join()
+        self.total_start = time.monotonic_ns()
+
+        print(f'PING {self.server_ip}')
+        asyncio.run(self._run_async())
 
         # Once finished, print out summary statistics
-        self.total_end = time.time() * 1000
+        self.total_end = time.monotonic_ns()
         print(self.summary_statistics())
 
 
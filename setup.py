@@ -0,0 +1,9 @@
+from setuptools import setup, Extension
+
+# Optional C accelerator for the ping checksum; build in place with
+# `python3 setup.py build_ext --inplace`
+setup(
+    name='ping_client',
+    py_modules=['ping_client'],
+    ext_modules=[Extension('_checksum', sources=['_checksum.c'])],
+)